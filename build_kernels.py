@@ -0,0 +1,36 @@
+"""
+Ahead-of-time compilation of the taxonomic_stats numeric kernels
+Author: Anestis Gkanogiannis
+Email: anestis@gkanogiannis.com
+Description:
+    Compiles the Numba kernels of taxonomic_stats.py into the 'tx_kernels' extension module,
+    next to this script. When the module is present, taxonomic_stats.py imports it instead of
+    compiling the kernels on first call.
+    The module records the KERNEL_VERSION it was built from, a stale module is ignored.
+    Rebuild it whenever the kernels change.
+
+Usage:
+    python build_kernels.py
+
+License:
+    MIT License (see LICENSE)
+"""
+
+import os
+from numba.pycc import CC
+from taxonomic_stats import KERNEL_VERSION, _group_sum_count_py
+
+def _kernel_version() -> int:
+    """
+    Returns the KERNEL_VERSION the module is built from, frozen at compile time.
+    """
+    return KERNEL_VERSION
+
+cc = CC("tx_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export("kernel_version", "int64()")(_kernel_version)
+cc.export("group_sum_count", "UniTuple(int64[:], 2)(int32[:], int64[:], int64)")(_group_sum_count_py)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -31,58 +31,336 @@ License:
     SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import os
 import sys
-from io import StringIO
+import hashlib
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
 import logging
-import argparse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
-def read_data(file_path: str | StringIO) -> pd.DataFrame:
+class TaxStatsError(Exception):
     """
-    Reads the input CSV file and handles missing/invalid data.
+    Raised for invalid input to the taxonomic data analysis.
+    """
+
+# Columns used by the summary statistics, the only ones read from the input (species is never used)
+SUMMARY_COLUMNS = ["phylum", "count"]
+
+# Directory, in the working directory, holding cached cleaned data
+CACHE_DIR = ".cache"
+
+# Part of the cache key, to be bumped whenever the reading or cleaning rules change
+CACHE_VERSION = 5
+
+# Version of the numeric kernels, to be bumped whenever one of them changes, so that a tx_kernels
+# module built from older kernels is not used
+KERNEL_VERSION = 1
+
+# Text accepted as a numeric count (integer, decimal or scientific notation)
+NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+# Text accepted as an integer count, converted exactly (up to 38 digits, the decimal128 precision)
+INTEGER_PATTERN = r"^[+-]?\d{1,38}$"
+
+# Bounds of an int64 count, as decimals to range check integer text before casting it
+INT64_MIN = pa.scalar(Decimal(-2**63), pa.decimal128(38, 0))
+INT64_MAX = pa.scalar(Decimal(2**63 - 1), pa.decimal128(38, 0))
+
+# Text read as a missing value, pandas' default NA strings (read_csv with keep_default_na=True)
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+]
+
+# Arrow CSV reader options, built once and shared by every read.
+# The dialect is fixed (comma separated, double quoted, one record per line) and every read column has
+# an explicit type, so nothing is sniffed or inferred. Columns are still matched by header name.
+# Blank (whitespace only) rows are skipped, any other row with the wrong number of fields fails the read.
+CSV_READ_OPTIONS = pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+CSV_PARSE_OPTIONS = pacsv.ParseOptions(
+    delimiter=",",
+    quote_char='"',
+    double_quote=True,
+    escape_char=False,
+    newlines_in_values=False,
+    invalid_row_handler=lambda row: "skip" if not row.text.strip() else "error"
+)
+CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(
+    include_columns=SUMMARY_COLUMNS,
+    column_types={
+        "phylum": pa.dictionary(pa.int32(), pa.string()),
+        # Read as text so that non numeric values become null instead of failing the read
+        "count": pa.string(),
+    },
+    null_values=NA_VALUES,
+    strings_can_be_null=True,
+)
+
+def _group_sum_count_py(codes: np.ndarray, counts: np.ndarray, ngroups: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sums counts and counts rows per group code in one pass. Rows with a negative (missing) code are skipped.
+    Compiled with Numba into _group_sum_count, ahead of time when tx_kernels is built.
+
+    Args:
+        codes (np.ndarray): Group code (int32) of each row, in the range [0, ngroups) or -1.
+        counts (np.ndarray): Species count of each row.
+        ngroups (int): Number of distinct groups.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Total count and number of rows per group.
+    """
+    totals = np.zeros(ngroups, dtype=np.int64)
+    sizes = np.zeros(ngroups, dtype=np.int64)
+    for i in range(len(codes)):
+        code = codes[i]
+        if code >= 0:
+            totals[code] += counts[i]
+            sizes[code] += 1
+    return totals, sizes
+
+def _aot_kernels():
+    """
+    Imports the ahead-of-time compiled kernels (see build_kernels.py), which need no JIT compilation
+    on first call. A tx_kernels module built from other kernels than KERNEL_VERSION is not used.
+    
+    Returns:
+        module | None: The tx_kernels module, or None when it is missing or stale.
+    """
+    try:
+        import tx_kernels
+    except ImportError:
+        return None
+    if not hasattr(tx_kernels, "kernel_version") or tx_kernels.kernel_version() != KERNEL_VERSION:
+        logging.warning("Ignoring stale tx_kernels module, rebuild it with build_kernels.py")
+        return None
+    return tx_kernels
+
+_tx_kernels = _aot_kernels()
+if _tx_kernels is not None:
+    _group_sum_count = _tx_kernels.group_sum_count
+else:
+    from numba import njit
+    _group_sum_count = njit(cache=True)(_group_sum_count_py)
+
+def _cache_path(file_path: str) -> str:
+    """
+    Builds the path of the cached cleaned data for an input file, keyed on the cache version and
+    the file's path, modification time and size. The file name starts with a prefix derived from
+    the path alone, shared by all the cache files of the same input.
     
     Args:
-        file_path (str | StringIO): Path to the input CSV file or a StringIO object.
+        file_path (str): Path to the input file.
     
     Returns:
-        pd.DataFrame: Cleaned data frame with valid rows.
+        str: Path to the cache Parquet file.
+    """
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    prefix = hashlib.blake2b(file_path.encode()).hexdigest()[:16]
+    key = f"{CACHE_VERSION}:{stat.st_mtime_ns}:{stat.st_size}"
+    key = hashlib.blake2b(key.encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{prefix}-{key}.parquet")
+
+def _write_cache(df: pd.DataFrame, cache_file: str):
+    """
+    Stores the cleaned data of an input file in its cache file, removing the older cache files of
+    the same input, so that a changing input does not fill the cache directory.
+    
+    Args:
+        df (pd.DataFrame): Cleaned data frame.
+        cache_file (str): Path to the cache Parquet file, as built by _cache_path.
     """
     try:
-        # Check if input is a file path or StringIO object
-        if isinstance(file_path, str):
-            if not os.path.exists(file_path):
-                logging.error("File not found: %s", file_path)
-                sys.exit(1)
-            df = pd.read_csv(file_path)
-        elif isinstance(file_path, StringIO):
-            df = pd.read_csv(file_path)
-        else:
-            logging.error("Invalid input: file_path must be a string or StringIO object.")
-            sys.exit(1)
-        
-        # Validate required columns
-        required_columns = {"species", "phylum", "count"}
-        if not required_columns.issubset(df.columns):
-            logging.error("Invalid file format. Required columns: %s", required_columns)
-            sys.exit(1)
-
-        # Handle missing and invalid data
-        df = df.dropna(subset=list(required_columns))
-        df["count"] = pd.to_numeric(df["count"], errors="coerce")
-        df = df.dropna(subset=["count"])  # Drop rows where count is not numeric
-        df["count"] = df["count"].astype(int)
-
-        logging.info("Data successfully loaded and cleaned.")
-        return df
+        # Written to a temporary file first, so that an interrupted or concurrent run never leaves a partial cache file
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_file, compression="zstd")
+            os.replace(tmp_file, cache_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+        prefix = os.path.basename(cache_file).split("-")[0] + "-"
+        for name in os.listdir(CACHE_DIR):
+            if name.startswith(prefix) and name.endswith(".parquet") and name != os.path.basename(cache_file):
+                os.remove(os.path.join(CACHE_DIR, name))
+    except OSError as e:
+        # Caching is an optimization only, a read-only location must not stop the analysis
+        logging.warning("Could not write cache file %s: %s", cache_file, e)
 
-    except Exception as e:
-        logging.error("Error while reading the file: %s", e)
-        sys.exit(1)
+def _parse_counts(text: pa.ChunkedArray | pa.Array) -> pa.ChunkedArray | pa.Array:
+    """
+    Converts a text (string or large_string) count column to int64 within Arrow. Integers are converted
+    exactly, decimal and scientific forms through float64 and truncated (see _truncate_counts).
+    Values that are not numeric, not finite or out of the int64 range become null.
+    
+    Args:
+        text (pa.ChunkedArray | pa.Array): Count column as read from the input.
+    
+    Returns:
+        pa.ChunkedArray | pa.Array: int64 count column.
+    """
+    text = pc.utf8_trim_whitespace(text)
+    is_integer = pc.match_substring_regex(text, INTEGER_PATTERN)
+    integers = pc.cast(pc.if_else(is_integer, text, pa.scalar(None, text.type)), pa.decimal128(38, 0))
+    in_range = pc.and_(pc.greater_equal(integers, INT64_MIN), pc.less_equal(integers, INT64_MAX))
+    integers = pc.cast(pc.if_else(in_range, integers, pa.scalar(None, integers.type)), pa.int64())
+    is_number = pc.and_(pc.invert(is_integer), pc.match_substring_regex(text, NUMBER_PATTERN))
+    numbers = pc.cast(pc.if_else(is_number, text, pa.scalar(None, text.type)), pa.float64())
+    return pc.coalesce(integers, _truncate_counts(numbers))
+
+def _truncate_counts(numbers: pa.ChunkedArray | pa.Array) -> pa.ChunkedArray | pa.Array:
+    """
+    Converts a float64 count column to int64 within Arrow, truncating like an integer cast.
+    Values that are NaN, not finite or out of the int64 range become null.
+    
+    Args:
+        numbers (pa.ChunkedArray | pa.Array): float64 count column.
+    
+    Returns:
+        pa.ChunkedArray | pa.Array: int64 count column.
+    """
+    # Comparisons with NaN are false, and infinite values fall outside the bounds
+    in_range = pc.and_(pc.greater_equal(numbers, -2.0**63), pc.less(numbers, 2.0**63))
+    return pc.cast(pc.trunc(pc.if_else(in_range, numbers, pa.scalar(None, pa.float64()))), pa.int64())
+
+def _clean_data(data: pa.Table | pa.RecordBatch) -> pd.DataFrame:
+    """
+    Converts Arrow data to a data frame, keeping only the rows with a phylum and a valid count.
+    count is converted to int64 within Arrow (text by _parse_counts, floats by _truncate_counts), so that
+    no column of Python string objects is materialized, and invalid rows are dropped by a single Arrow
+    filter, so that counts reach pandas without missing values and are never widened to float.
+    
+    Args:
+        data (pa.Table | pa.RecordBatch): Data as read from the input.
+    
+    Returns:
+        pd.DataFrame: Cleaned data frame with a categorical phylum and an int64 count column.
+    """
+    index = data.schema.get_field_index("count")
+    counts = data.column(index)
+    # pandas writes text columns to Parquet as large_string
+    if pa.types.is_string(counts.type) or pa.types.is_large_string(counts.type):
+        counts = _parse_counts(counts)
+    elif pa.types.is_floating(counts.type):
+        counts = _truncate_counts(pc.cast(counts, pa.float64()))
+    elif pa.types.is_integer(counts.type):
+        counts = pc.cast(counts, pa.int64())
+    else:
+        raise TaxStatsError(f"Invalid file format: count column of type {counts.type}")
+    data = data.set_column(index, "count", counts)
+    data = data.filter(pc.and_(pc.is_valid(data.column("phylum")), pc.is_valid(counts)))
+    # pandas metadata of a Parquet input describes the columns as written, not as converted here
+    return data.to_pandas(ignore_metadata=True)
+
+def _build_summary(phyla: np.ndarray, totals: np.ndarray, sizes: np.ndarray) -> pd.DataFrame:
+    """
+    Builds the summary statistics table from the per phylum totals and group sizes.
+    
+    Args:
+        phyla (np.ndarray): Phylum names.
+        totals (np.ndarray): Total species count per phylum.
+        sizes (np.ndarray): Number of species per phylum.
+    
+    Returns:
+        pd.DataFrame: Summary statistics per phylum.
+    """
+    return pd.DataFrame({
+        "phylum": phyla,
+        "total_species_count": totals,
+        "average_species_count": totals / sizes
+    })
+
+def read_data(file_path: str | StringIO, use_cache: bool = True) -> pd.DataFrame:
+    """
+    Reads the input CSV or Parquet file and handles missing/invalid data.
+    
+    Args:
+        file_path (str | StringIO): Path to the input CSV/Parquet file or a StringIO object with CSV data.
+        use_cache (bool): Reuse (or store) the cleaned data of an unchanged input CSV file. Defaults to True.
+    
+    Returns:
+        pd.DataFrame: Cleaned data frame with valid rows.
+    """
+    # Check if input is a file path or StringIO object
+    if isinstance(file_path, str):
+        if not os.path.exists(file_path):
+            raise TaxStatsError(f"File not found: {file_path}")
+        source = file_path
+    elif isinstance(file_path, StringIO):
+        # Arrow's reader works on bytes, not text streams
+        source = BytesIO(file_path.read().encode())
+    else:
+        raise TaxStatsError("Invalid input: file_path must be a string or StringIO object.")
+
+    # Reuse the cleaned data of a previous run if the input CSV file is unchanged
+    cache_file = None
+    if use_cache and isinstance(source, str) and not source.endswith(".parquet"):
+        cache_file = _cache_path(source)
+        if os.path.exists(cache_file):
+            try:
+                df = pd.read_parquet(cache_file)
+                logging.info("Data successfully loaded from cache %s", cache_file)
+                return df
+            except (pa.ArrowInvalid, OSError) as e:
+                # An unreadable cache file is a cache miss, it is rewritten below
+                logging.warning("Ignoring unreadable cache file %s: %s", cache_file, e)
+
+    if isinstance(source, str) and source.endswith(".parquet"):
+        # Columnar input
+        try:
+            table = pq.read_table(source, columns=SUMMARY_COLUMNS, read_dictionary=["phylum"])
+        except (pa.ArrowKeyError, pa.ArrowInvalid) as e:
+            # A missing column or a corrupt Parquet file
+            raise TaxStatsError(f"Invalid file format: {e}") from e
+    else:
+        # Parse with Arrow's multithreaded reader, projecting and typing the needed columns
+        try:
+            table = pacsv.read_csv(
+                source,
+                read_options=CSV_READ_OPTIONS,
+                parse_options=CSV_PARSE_OPTIONS,
+                convert_options=CSV_CONVERT_OPTIONS
+            )
+        except (pa.ArrowKeyError, pa.ArrowInvalid) as e:
+            # A missing column or malformed CSV data
+            raise TaxStatsError(f"Invalid file format: {e}") from e
+    # Handle missing and invalid data
+    df = _clean_data(table)
+    # Arrow orders dictionary values by appearance; keep phyla in lexical order
+    df["phylum"] = df["phylum"].cat.reorder_categories(df["phylum"].cat.categories.sort_values())
+
+    if cache_file:
+        _write_cache(df, cache_file)
+
+    logging.info("Data successfully loaded and cleaned.")
+    return df
+
+
+def convert_csv_to_parquet(input_csv: str | StringIO, output_parquet: str, use_cache: bool = True):
+    """
+    Converts an input CSV file to Parquet, storing the cleaned data with phylum dictionary-encoded.
+    
+    Args:
+        input_csv (str | StringIO): Path to the input CSV file or a StringIO object.
+        output_parquet (str): Path to the output Parquet file.
+        use_cache (bool): Reuse (or store) the cleaned data of an unchanged input CSV file. Defaults to True.
+    """
+    df = read_data(input_csv, use_cache=use_cache)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, output_parquet, compression="snappy", use_dictionary=["phylum"], row_group_size=1 << 20)
+    logging.info("Parquet file saved to %s", output_parquet)
 
 def calculate_summary_statistics(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -94,20 +372,79 @@ def calculate_summary_statistics(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Summary statistics per phylum.
     """
+    phylum = df["phylum"]
+    if isinstance(phylum.dtype, pd.CategoricalDtype):
+        # Dictionary-encoded at read time, the integer codes are used as they are
+        codes = phylum.cat.codes.to_numpy(dtype=np.int32)
+        phyla = phylum.cat.categories
+    else:
+        codes, phyla = pd.factorize(phylum, sort=True)
+        codes = codes.astype(np.int32)
+    counts = df["count"].to_numpy(dtype=np.int64)
+
+    # Accumulate totals and group sizes in a single fused pass over the codes
+    totals, sizes = _group_sum_count(codes, counts, len(phyla))
+
+    # Categories without any row are not reported
+    present = sizes > 0
+    summary = _build_summary(phyla[present], totals[present], sizes[present])
+    logging.info("Summary statistics successfully calculated.")
+    return summary
+
+def summarize_csv_stream(file_path: str, block_size: int = 16 << 20) -> pd.DataFrame:
+    """
+    Calculates total and average species count per phylum reading the input CSV file block by block,
+    so that memory use is bounded by the block size instead of the file size.
+    
+    Args:
+        file_path (str): Path to the input CSV file.
+        block_size (int): Size in bytes of the blocks read at a time. Defaults to 16 MiB.
+    
+    Returns:
+        pd.DataFrame: Summary statistics per phylum.
+    """
+    if not os.path.exists(file_path):
+        raise TaxStatsError(f"File not found: {file_path}")
+    if file_path.endswith(".parquet"):
+        raise TaxStatsError("Streaming applies to CSV input only, Parquet input is read with read_data.")
+
+    # Partial results per phylum, extended as new phyla show up in later blocks
+    phylum_codes = {}
+    totals = np.zeros(0, dtype=np.int64)
+    sizes = np.zeros(0, dtype=np.int64)
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=block_size)
     try:
-        summary = (
-            df.groupby("phylum", as_index=False)
-            .agg(
-                total_species_count=("count", "sum"),
-                average_species_count=("count", "mean")
-            )
+        reader = pacsv.open_csv(
+            file_path,
+            read_options=read_options,
+            parse_options=CSV_PARSE_OPTIONS,
+            convert_options=CSV_CONVERT_OPTIONS
         )
-        summary["average_species_count"] = summary["average_species_count"].round(2)
-        logging.info("Summary statistics successfully calculated.")
-        return summary
-    except Exception as e:
-        logging.error("Error calculating summary statistics: %s", e)
-        sys.exit(1)
+        with reader:
+            for batch in reader:
+                block = _clean_data(batch)
+                # Map the block's own phylum dictionary onto the codes shared by all blocks
+                block_codes = np.array(
+                    [phylum_codes.setdefault(phylum, len(phylum_codes)) for phylum in block["phylum"].cat.categories],
+                    dtype=np.int32
+                )
+                codes = block_codes[block["phylum"].cat.codes.to_numpy()]
+                block_totals, block_sizes = _group_sum_count(
+                    codes, block["count"].to_numpy(dtype=np.int64), len(phylum_codes)
+                )
+                totals = np.pad(totals, (0, len(phylum_codes) - len(totals))) + block_totals
+                sizes = np.pad(sizes, (0, len(phylum_codes) - len(sizes))) + block_sizes
+    except (pa.ArrowKeyError, pa.ArrowInvalid) as e:
+        # A missing column or malformed CSV data, detected when opening or within any block
+        raise TaxStatsError(f"Invalid file format: {e}") from e
+
+    # Keep phyla with at least one valid row, in lexical order
+    phyla = np.array(list(phylum_codes), dtype=object)
+    order = np.argsort(phyla)
+    order = order[sizes[order] > 0]
+    summary = _build_summary(phyla[order], totals[order], sizes[order])
+    logging.info("Summary statistics successfully calculated.")
+    return summary
 
 def save_results(df: pd.DataFrame, output_file: str):
     """
@@ -117,12 +454,26 @@ def save_results(df: pd.DataFrame, output_file: str):
         df (pd.DataFrame): Summary statistics data.
         output_file (str): Path to the output CSV file.
     """
-    try:
-        df.to_csv(output_file, index=False)
-        logging.info("Results saved to %s", output_file)
-    except Exception as e:
-        logging.error("Error saving results to file: %s", e)
-        sys.exit(1)
+    # Averages are rounded to 2 decimals once, so that both writers below output the same values
+    df = df.round(2)
+    # Arrow's writer quotes either every text value or none, so data with values that need quoting
+    # (delimiter, quote or line break) is written by pandas, which quotes only those values
+    text = df.select_dtypes(exclude="number")
+    needs_quoting = any(text[column].astype(str).str.contains(r'[",\r\n]').any() for column in text.columns)
+    if needs_quoting:
+        df.to_csv(output_file, index=False, float_format="%.2f")
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Averages are cast to a 2 decimals type, which is written as a number (e.g. 1.00)
+        for i, field in enumerate(table.schema):
+            if pa.types.is_floating(field.type):
+                table = table.set_column(i, field.name, pc.cast(table.column(i), pa.decimal128(38, 2)))
+        pacsv.write_csv(
+            table,
+            output_file,
+            write_options=pacsv.WriteOptions(quoting_style="none", quoting_header="none")
+        )
+    logging.info("Results saved to %s", output_file)
 
 def generate_bar_chart(df: pd.DataFrame, output_image: str):
     """
@@ -132,25 +483,27 @@ def generate_bar_chart(df: pd.DataFrame, output_image: str):
         df (pd.DataFrame): Summary statistics data.
         output_image (str): Path to save the bar chart image.
     """
-    try:
-        plt.figure(figsize=(10, 6))
-        plt.bar(df["phylum"], df["total_species_count"], color="skyblue")
-        plt.title("Total Species Count by Phylum", fontsize=14)
-        plt.xlabel("Phylum", fontsize=12)
-        plt.ylabel("Total Species Count", fontsize=12)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig(output_image)
-        plt.close()
-        logging.info("Bar chart saved to %s", output_image)
-    except Exception as e:
-        logging.error("Error generating bar chart: %s", e)
-        sys.exit(1)
+    # Imported here, so that runs without a plot do not pay for importing matplotlib
+    from matplotlib.figure import Figure
+
+    # A standalone Figure renders with Agg, without pyplot's global state or GUI backend selection
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.bar(df["phylum"], df["total_species_count"], color="skyblue")
+    ax.set_title("Total Species Count by Phylum", fontsize=14)
+    ax.set_xlabel("Phylum", fontsize=12)
+    ax.set_ylabel("Total Species Count", fontsize=12)
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
+    fig.savefig(output_image)
+    logging.info("Bar chart saved to %s", output_image)
 
 def main():
     """
     Main function to execute the script workflow.
     """
+    import argparse
+
     # Parse command-line arguments
     parser = argparse.ArgumentParser(
         description=(
@@ -159,14 +512,17 @@ def main():
             "save results to a CSV file, and generate a bar chart visualization.\n\n"
             "Examples:\n"
             "  python taxonomic_stats.py\n"
-            "  python taxonomic_stats.py -i custom_data.csv -o custom_summary.csv -p custom_plot.png"
+            "  python taxonomic_stats.py -i custom_data.csv -o custom_summary.csv -p custom_plot.png\n"
+            "  python taxonomic_stats.py -i custom_data.csv -o custom_summary.csv --no-plot\n"
+            "  python taxonomic_stats.py -i custom_data.csv --to-parquet custom_data.parquet\n"
+            "  python taxonomic_stats.py -i custom_data.parquet"
         ),
         formatter_class=argparse.RawTextHelpFormatter
     )
 
     parser.add_argument(
         "-i", "--input", type=str, default="taxonomic_data.csv",
-        help="Path to the input CSV file. Defaults to 'taxonomic_data.csv'."
+        help="Path to the input CSV or Parquet (.parquet) file. Defaults to 'taxonomic_data.csv'."
     )
     parser.add_argument(
         "-o", "--output", type=str, default="phylum_summary.csv",
@@ -176,24 +532,57 @@ def main():
         "-p", "--plot", type=str, default="phylum_species_count.png",
         help="Path to the output bar chart image file. Defaults to 'phylum_species_count.png'."
     )
+    parser.add_argument(
+        "--no-plot", action="store_true",
+        help="Do not generate the bar chart."
+    )
+    parser.add_argument(
+        "--to-parquet", type=str, default=None,
+        help="Convert the input CSV file to a Parquet file at this path and exit."
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Do not reuse or store the cleaned input data in the '.cache' directory of the working directory."
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Read the input CSV file block by block, keeping memory use low for very large files."
+    )
     args = parser.parse_args()
+    if args.stream and args.input.endswith(".parquet"):
+        parser.error("--stream applies to CSV input only, Parquet input is already read column by column.")
 
     # Assign arguments to variables
     input_file = args.input
     output_csv = args.output
     output_image = args.plot
 
-    # Step 1: Read and clean the data
-    data = read_data(input_file)
+    try:
+        # Optional one-time conversion of the input to Parquet
+        if args.to_parquet:
+            convert_csv_to_parquet(input_file, args.to_parquet, use_cache=not args.no_cache)
+            return
 
-    # Step 2: Calculate summary statistics
-    summary_stats = calculate_summary_statistics(data)
+        if args.stream:
+            # Steps 1-2: Read the data and calculate summary statistics block by block
+            summary_stats = summarize_csv_stream(input_file)
+        else:
+            # Step 1: Read and clean the data
+            data = read_data(input_file, use_cache=not args.no_cache)
 
-    # Step 3: Save results to CSV
-    save_results(summary_stats, output_csv)
+            # Step 2: Calculate summary statistics
+            summary_stats = calculate_summary_statistics(data)
 
-    # Step 4: Generate bar chart
-    generate_bar_chart(summary_stats, output_image)
+        # Step 3: Save results to CSV
+        save_results(summary_stats, output_csv)
+
+        # Step 4: Generate bar chart
+        if not args.no_plot:
+            generate_bar_chart(summary_stats, output_image)
+    except Exception as e:
+        # Library functions raise, only the command line exits with an error status
+        logging.error("Task failed: %s", e)
+        sys.exit(1)
 
     logging.info("Task completed successfully!")
 
@@ -2,7 +2,7 @@
 
 # Usage function to display help
 usage() {
-    echo "Usage: $0 [-i|--input <input_file>] [-o|--output <output_file>] [-p|--plot <plot_file>]"
+    echo "Usage: $0 [-i|--input <input_file>] [-o|--output <output_file>] [-p|--plot <plot_file>] [--no-plot]"
     echo "If no arguments are provided, then the script will use taxonomic_data.csv as input, phylum_summary.csv and phylum_species_count.png as outputs in the current directory."
     exit 1
 }
@@ -11,6 +11,7 @@ usage() {
 INPUT_FILE=""
 OUTPUT_FILE=""
 PLOT_FILE=""
+NO_PLOT=""
 while [[ $# -gt 0 ]]; do
     case "$1" in
         -i|--input)
@@ -25,6 +26,10 @@ while [[ $# -gt 0 ]]; do
             PLOT_FILE="$2"
             shift 2
             ;;
+        --no-plot)
+            NO_PLOT="--no-plot"
+            shift
+            ;;
         *)
             usage
             ;;
@@ -34,7 +39,7 @@ done
 # Check if no arguments are provided
 if [[ -z "$INPUT_FILE" && -z "$OUTPUT_FILE" && -z "$PLOT_FILE" ]]; then
     # Mount the current folder to /app and run the container without arguments
-    docker run --rm -v "$(pwd):/data" gkanogiannis/taxonomic_stats
+    docker run --rm -v "$(pwd):/data" gkanogiannis/taxonomic_stats $NO_PLOT
     exit 0
 fi
 
@@ -96,5 +101,9 @@ if [[ -n "$PLOT_FILE" ]]; then
     DOCKER_CMD="$DOCKER_CMD -p \"/data/plot/$(basename "$PLOT_FILE")\""
 fi
 
+if [[ -n "$NO_PLOT" ]]; then
+    DOCKER_CMD="$DOCKER_CMD $NO_PLOT"
+fi
+
 # Execute the command
 eval "$DOCKER_CMD"
@@ -1,7 +1,13 @@
+import os
+import sys
+import types
+import tempfile
 import unittest
+from unittest import mock
 import pandas as pd
+import pyarrow as pa
 from io import StringIO
-from taxonomic_stats import read_data, calculate_summary_statistics
+from taxonomic_stats import KERNEL_VERSION, TaxStatsError, _aot_kernels, _cache_path, _clean_data, read_data, convert_csv_to_parquet, calculate_summary_statistics, summarize_csv_stream, save_results
 
 class TestTaxonomicDataAnalysis(unittest.TestCase):
     """
@@ -10,7 +16,7 @@ class TestTaxonomicDataAnalysis(unittest.TestCase):
 
     def setUp(self):
         """
-        Set up sample data for tests.
+        Set up sample data and a temporary directory for tests.
         """
         self.valid_data = """species,phylum,count
         SpeciesA,Firmicutes,120
@@ -37,6 +43,38 @@ class TestTaxonomicDataAnalysis(unittest.TestCase):
         SpeciesC,Bacteroidetes,200
         """
 
+        # Temporary directory for test files, also holding the cache directory instead of the working directory
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.cache_dir = os.path.join(self.tmp_dir, ".cache")
+        cache_patch = mock.patch("taxonomic_stats.CACHE_DIR", self.cache_dir)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+    def write_csv(self, data: str) -> str:
+        """
+        Write CSV data to a file in the temporary directory, returning its path.
+        """
+        csv_file = os.path.join(self.tmp_dir, "data.csv")
+        with open(csv_file, "w") as f:
+            f.write(data)
+        return csv_file
+
+    def save_summary(self, phyla: list, totals: list, averages: list) -> str:
+        """
+        Save summary statistics with save_results to a file in the temporary directory, returning its content.
+        """
+        summary = pd.DataFrame({
+            "phylum": phyla,
+            "total_species_count": totals,
+            "average_species_count": averages
+        })
+        output_file = os.path.join(self.tmp_dir, "summary.csv")
+        save_results(summary, output_file)
+        with open(output_file) as f:
+            return f.read()
+
     def test_read_data_valid(self):
         """
         Test read_data function with valid data.
@@ -47,15 +85,40 @@ class TestTaxonomicDataAnalysis(unittest.TestCase):
         self.assertEqual(df.shape[0], 5)  # Expect 5 valid rows
         self.assertIn("phylum", df.columns)
         self.assertIn("count", df.columns)
+        self.assertNotIn("species", df.columns)  # Unused column is not read
 
     def test_read_data_missing_columns(self):
         """
         Test read_data function with missing columns.
         """
         data = StringIO(self.invalid_data_missing_columns)
-        with self.assertRaises(SystemExit):
+        with self.assertRaises(TaxStatsError):
             read_data(data)
 
+    def test_read_data_extra_fields(self):
+        """
+        Test read_data function with a row having more fields than the header.
+        """
+        data = StringIO("species,phylum,count\nSpeciesA,Firmicutes,120\nSpeciesB,Firmicutes,1,000\n")
+        with self.assertRaises(TaxStatsError):
+            read_data(data)
+
+    def test_read_data_missing_file(self):
+        """
+        Test read_data function with a file that does not exist.
+        """
+        with self.assertRaises(TaxStatsError):
+            read_data("does_not_exist.csv")
+
+    def test_read_data_column_order(self):
+        """
+        Test read_data function with the columns in a different order.
+        """
+        data = StringIO("count,species,phylum\n120,SpeciesA,Firmicutes\n80,SpeciesB,Firmicutes\n")
+        df = read_data(data)
+        self.assertListEqual(df["count"].tolist(), [120, 80])
+        self.assertListEqual(df["phylum"].tolist(), ["Firmicutes", "Firmicutes"])
+
     def test_read_data_missing_values(self):
         """
         Test read_data function with missing values.
@@ -64,6 +127,15 @@ class TestTaxonomicDataAnalysis(unittest.TestCase):
         df = read_data(data)
         self.assertEqual(df.shape[0], 1)  # Only 1 valid row should remain
 
+    def test_read_data_na_values(self):
+        """
+        Test read_data function with phyla spelled as pandas' default NA strings.
+        """
+        rows = [f"Species{i},{phylum},10" for i, phylum in enumerate(["null", "None", "nan", "n/a", "#N/A", "<NA>", "Firmicutes"])]
+        data = StringIO("species,phylum,count\n" + "\n".join(rows) + "\n")
+        df = read_data(data)
+        self.assertListEqual(df["phylum"].tolist(), ["Firmicutes"])  # Only the named phylum should remain
+
     def test_read_data_type_values(self):
         """
         Test read_data function with non numeric count values.
@@ -72,6 +144,97 @@ class TestTaxonomicDataAnalysis(unittest.TestCase):
         df = read_data(data)
         self.assertEqual(df.shape[0], 2)  # Only 2 valid rows should remain
 
+    def test_read_data_large_values(self):
+        """
+        Test read_data function keeping large counts exact and dropping out of range counts.
+        """
+        data = StringIO("species,phylum,count\nA,P1,9007199254740993\nB,P1,1e400\nC,P2,9223372036854775808\nD,P2,2.5\n")
+        df = read_data(data, use_cache=False)
+        self.assertListEqual(df["count"].tolist(), [9007199254740993, 2])
+
+    def test_clean_data_float_values(self):
+        """
+        Test _clean_data function dropping float counts that are missing, infinite or out of the int64 range.
+        """
+        data = pa.table({
+            "phylum": pa.array(["P1", "P1", "P1", "P1", "P1", None]).dictionary_encode(),
+            "count": [float("nan"), float("inf"), 1e19, None, 3.7, 4.0],
+        })
+        df = _clean_data(data)
+        self.assertListEqual(df["count"].tolist(), [3])
+        self.assertEqual(df["count"].dtype, "int64")
+
+    def test_read_data_cache(self):
+        """
+        Test read_data function reusing the cached data of an unchanged file.
+        """
+        csv_file = self.write_csv(self.invalid_data_type_values)
+        df = read_data(csv_file)
+        self.assertEqual(os.listdir(self.cache_dir), [os.path.basename(_cache_path(csv_file))])
+        cached_df = read_data(csv_file)
+        self.assertEqual(cached_df.shape[0], 2)  # Only 2 valid rows should remain
+        self.assertListEqual(cached_df["count"].tolist(), df["count"].tolist())
+
+    def test_read_data_changed_cache(self):
+        """
+        Test read_data function replacing the cached data of a changed file.
+        """
+        read_data(self.write_csv(self.invalid_data_type_values))
+        csv_file = self.write_csv(self.valid_data)
+        df = read_data(csv_file)
+        self.assertEqual(os.listdir(self.cache_dir), [os.path.basename(_cache_path(csv_file))])
+        self.assertEqual(df.shape[0], 5)  # Expect 5 valid rows of the changed file
+
+    def test_read_data_corrupt_cache(self):
+        """
+        Test read_data function treating an unreadable cache file as a cache miss.
+        """
+        csv_file = self.write_csv(self.invalid_data_type_values)
+        read_data(csv_file)
+        with open(_cache_path(csv_file), "wb") as f:
+            f.write(b"PAR1 truncated")
+        df = read_data(csv_file)
+        cached_df = read_data(csv_file)  # Rewritten by the previous read
+        self.assertEqual(df.shape[0], 2)  # Only 2 valid rows should remain
+        self.assertEqual(cached_df.shape[0], 2)
+
+    def test_read_data_parquet(self):
+        """
+        Test read_data function with a Parquet file converted from CSV.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            parquet_file = os.path.join(tmp_dir, "data.parquet")
+            convert_csv_to_parquet(StringIO(self.valid_data), parquet_file)
+            df = read_data(parquet_file)
+        self.assertEqual(df.shape[0], 5)  # Expect 5 valid rows
+        self.assertNotIn("species", df.columns)  # Only the needed columns are read
+        summary = calculate_summary_statistics(df)
+        self.assertEqual(summary.loc[summary["phylum"] == "Firmicutes", "total_species_count"].values[0], 200)
+
+    def test_read_data_parquet_text_values(self):
+        """
+        Test read_data function with a Parquet file holding count as text.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            parquet_file = os.path.join(tmp_dir, "data.parquet")
+            pd.DataFrame({
+                "species": ["SpeciesA", "SpeciesB", "SpeciesC"],
+                "phylum": ["Firmicutes", "Firmicutes", "Bacteroidetes"],
+                "count": ["120", "not_numeric", " 80 "]
+            }).to_parquet(parquet_file)
+            df = read_data(parquet_file)
+        self.assertListEqual(df["count"].tolist(), [120, 80])  # Only 2 valid rows should remain
+
+    def test_read_data_parquet_missing_columns(self):
+        """
+        Test read_data function with a Parquet file missing required columns.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            parquet_file = os.path.join(tmp_dir, "data.parquet")
+            pd.DataFrame({"species": ["Species1"], "count": [10]}).to_parquet(parquet_file)
+            with self.assertRaises(TaxStatsError):
+                read_data(parquet_file, use_cache=False)
+
     def test_calculate_summary_statistics(self):
         """
         Test calculate_summary_statistics function with valid input.
@@ -84,6 +247,62 @@ class TestTaxonomicDataAnalysis(unittest.TestCase):
         self.assertEqual(summary.loc[summary["phylum"] == "Firmicutes", "total_species_count"].values[0], 200)
         self.assertAlmostEqual(summary.loc[summary["phylum"] == "Firmicutes", "average_species_count"].values[0], 100.0)
 
+    def test_summarize_csv_stream(self):
+        """
+        Test summarize_csv_stream function against the in-memory summary, with several blocks.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_file = os.path.join(tmp_dir, "data.csv")
+            with open(csv_file, "w") as f:
+                f.write(self.valid_data + self.invalid_data_type_values.split("\n", 1)[1])
+            expected = calculate_summary_statistics(read_data(csv_file, use_cache=False))
+            summary = summarize_csv_stream(csv_file, block_size=64)
+        self.assertListEqual(summary["phylum"].tolist(), list(expected["phylum"]))
+        self.assertListEqual(summary["total_species_count"].tolist(), expected["total_species_count"].tolist())
+        self.assertListEqual(summary["average_species_count"].tolist(), expected["average_species_count"].tolist())
+
+    def test_summarize_csv_stream_parquet(self):
+        """
+        Test summarize_csv_stream function rejecting a Parquet file.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            parquet_file = os.path.join(tmp_dir, "data.parquet")
+            convert_csv_to_parquet(StringIO(self.valid_data), parquet_file)
+            with self.assertRaises(TaxStatsError):
+                summarize_csv_stream(parquet_file)
+
+    def test_save_results(self):
+        """
+        Test save_results function output, with averages written with 2 decimals.
+        """
+        content = self.save_summary(["F", "G"], [1, 310], [1.0, 310 / 3])
+        self.assertEqual(content, "phylum,total_species_count,average_species_count\nF,1,1.00\nG,310,103.33\n")
+
+    def test_save_results_quoting(self):
+        """
+        Test save_results function output, with a phylum that needs quoting.
+        """
+        content = self.save_summary(["F,x", "G"], [1, 2], [1.0, 2.0])
+        self.assertEqual(content, 'phylum,total_species_count,average_species_count\n"F,x",1,1.00\nG,2,2.00\n')
+
+    def test_save_results_rounding(self):
+        """
+        Test save_results function rounding an average the same way with and without quoting.
+        """
+        content = self.save_summary(["F"], [223], [223 / 200])
+        quoted_content = self.save_summary(["F,x"], [223], [223 / 200])
+        self.assertEqual(content.split(",")[-1], quoted_content.split(",")[-1])
+
+    def test_aot_kernels_version(self):
+        """
+        Test _aot_kernels function ignoring a tx_kernels module built from other kernels.
+        """
+        for version, expected in [(KERNEL_VERSION, True), (KERNEL_VERSION - 1, False)]:
+            tx_kernels = types.ModuleType("tx_kernels")
+            tx_kernels.kernel_version = lambda version=version: version
+            with mock.patch.dict(sys.modules, {"tx_kernels": tx_kernels}):
+                self.assertEqual(_aot_kernels() is tx_kernels, expected)
+
     def test_empty_dataframe(self):
         """
         Test calculate_summary_statistics with an empty DataFrame.